@@ -3,163 +3,381 @@ ChromeForge - Chrome Extension Generator
 Generates Chrome extensions from natural language descriptions
 """
 
-import json
-import os
+import functools
 import re
-from manifest_builder import generate_manifest
-from code_generator import CodeGenerator
+import string
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import List
+
+
+# Keyword tables consulted by PromptAnalyzer. Keywords are lowercase word
+# sequences; the last keyword word matches a prompt word that starts with it
+# and the others match whole words, so 'highlight' matches "highlights" but
+# 'phone number' no longer fires on "telephone".
+POPUP_KEYWORDS = frozenset({
+    'popup', 'button in', 'menu', 'click a button', 'interface', 'ui',
+    'show a popup', 'display', 'panel', 'window', 'input', 'form',
+    'today\'s date', 'calculator', 'converter', 'list'
+})
+
+CONTENT_KEYWORDS = frozenset({
+    'highlight', 'webpage', 'website', 'page', 'dom', 'text',
+    'change', 'modify', 'replace', 'extract', 'find', 'search',
+    'color', 'style', 'hide', 'remove', 'add', 'insert',
+    'phone number', 'email', 'link', 'image', 'element',
+    'all websites', 'any website', 'every page'
+})
+
+BACKGROUND_KEYWORDS = frozenset({
+    'block', 'blocking', 'automation', 'automatic', 'alarm',
+    'timer', 'schedule', 'filter', 'url', 'monitor', 'track',
+    'every time', 'on startup', 'browser opens', 'redirect',
+    'intercept', 'request', 'api call', 'fetch', 'listener'
+})
+
+CSS_KEYWORDS = frozenset({
+    'style', 'css', 'color', 'theme', 'design', 'beautiful',
+    'styled', 'gradient', 'background', 'font', 'layout'
+})
+
+TIMER_KEYWORDS = frozenset({'timer', 'pomodoro'})
+
+# (trigger keywords, permissions added when any of them is present)
+PERMISSION_RULES = (
+    (frozenset({'storage', 'save', 'remember'}), ('storage',)),
+    (frozenset({'tab', 'url', 'website'}), ('tabs',)),
+    (frozenset({'block', 'filter'}), (
+        'webRequest', 'webRequestBlocking',
+        'declarativeNetRequest', 'declarativeNetRequestWithHostAccess',
+    )),
+    (frozenset({'alarm', 'timer', 'schedule'}), ('alarms',)),
+)
+
+PERMISSION_KEYWORDS = frozenset().union(*(triggers for triggers, _ in PERMISSION_RULES))
+
+
+# Punctuation (other than the apostrophe) separates words, as do common
+# typographic dashes and double quotes; curly single quotes count as
+# straight ones.
+_STRIP_TABLE = str.maketrans({
+    **{c: ' ' for c in string.punctuation if c != "'"},
+    **{c: ' ' for c in '\u2013\u2014\u201c\u201d'},
+    '\u2018': "'",
+    '\u2019': "'",
+})
+
+# Lowercasing plus _STRIP_TABLE for ASCII prompts, with tabs and newlines
+# also turned into spaces; one bytes.translate is far cheaper than
+# str.lower() and str.translate with a dict
+_ASCII_SEPARATORS = ''.join(c for c in string.punctuation if c != "'") + '\t\n\r\x0b\x0c'
+_ASCII_STRIP_TABLE = bytes.maketrans(
+    (string.ascii_uppercase + _ASCII_SEPARATORS).encode('ascii'),
+    (string.ascii_lowercase + ' ' * len(_ASCII_SEPARATORS)).encode('ascii'),
+)
+
+# An apostrophe belongs to a word ("today's") only between two word
+# characters; anywhere else it is a quote mark and separates words
+_QUOTE_PATTERN = re.compile(r"(?<!\w)'|'(?!\w)")
+
+
+def _normalize(prompt):
+    """Lowercase ``prompt`` with every word separator turned into a space"""
+    if prompt.isascii():
+        text = prompt.encode('ascii').translate(_ASCII_STRIP_TABLE).decode('ascii')
+        if "'" in text:
+            text = _QUOTE_PATTERN.sub(' ', text)
+        return text
+    text = prompt.lower().translate(_STRIP_TABLE)
+    return ' '.join(_QUOTE_PATTERN.sub(' ', text).split())
+
+
+def compile_keywords(keywords):
+    """Compile ``keywords`` into an index for :func:`find_keywords`.
+
+    The keywords are folded into a character trie and emitted as a single
+    regex, so each word start in the prompt costs one descent instead of a
+    probe per keyword. A keyword's final word matches any prompt word it
+    starts; the space after every other word makes those match whole words
+    only, so the 'a' in 'click a button' does not match "add". The pattern
+    reports the longest keyword at each word start, and the index maps it
+    to the other keywords that are a prefix of it ('block' for 'blocking').
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [(' +' if char == ' ' else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # greedy, so the longest keyword wins and shorter ones are backtracked to
+        return '(?:' + body + ')?' if '' in node else body
+
+    # The pattern is zero-width after each separating space, so keywords
+    # that start inside another match are still found; a leading space lets
+    # the regex engine jump straight between words. ``first`` covers the
+    # word at the very start of the prompt, which has no space before it.
+    body = emit(trie)
+    pattern = re.compile(' (?=(' + body + '))')
+    first = re.compile(body)
+    implied = {}
+    for keyword in keywords:
+        nested = frozenset(other for other in keywords if other != keyword and keyword.startswith(other))
+        if nested:
+            implied[keyword] = nested
+    return pattern, first, frozenset(keywords).difference(implied), implied
+
+
+def find_keywords(index, prompt):
+    """Return the set of keywords of ``index`` found in ``prompt``.
+
+    ``index`` comes from :func:`compile_keywords`.
+    """
+    pattern, first, plain, implied = index
+    text = _normalize(prompt)
+    hits = set(pattern.findall(text))
+    match = first.match(text)
+    if match is not None:
+        hits.add(match.group())
+    if hits.issubset(plain):
+        return hits
+    for keyword in hits - plain:
+        if keyword not in implied:
+            # a multi-word keyword matched across a run of separators
+            hits.discard(keyword)
+            keyword = ' '.join(keyword.split())
+            hits.add(keyword)
+        hits.update(implied.get(keyword, ()))
+    return hits
+
+
+def _all_keywords():
+    """Every keyword PromptAnalyzer looks for"""
+    keywords = POPUP_KEYWORDS | CONTENT_KEYWORDS | BACKGROUND_KEYWORDS | CSS_KEYWORDS
+    keywords |= TIMER_KEYWORDS | {'extract', 'display'}
+    return keywords | PERMISSION_KEYWORDS
+
+
+_keyword_index = None
+_keyword_index_lock = threading.Lock()
+
+
+def _get_keyword_index():
+    """Return the compiled analyzer keywords, building them on first use"""
+    global _keyword_index
+    if _keyword_index is None:
+        with _keyword_index_lock:
+            if _keyword_index is None:
+                _keyword_index = compile_keywords(_all_keywords())
+    return _keyword_index
+
+
+def _set_flag(name):
+    """Action that switches on requirement ``name``"""
+    def action(requirements):
+        requirements[name] = True
+    return action
+
+
+def _grant(permissions):
+    """Action that adds ``permissions`` to the requirement set"""
+    def action(requirements):
+        requirements['permissions'].update(permissions)
+    return action
+
+
+def _build_actions():
+    """Map each keyword to the requirement mutations it triggers"""
+    actions = {}
+
+    def register(keywords, action):
+        for keyword in keywords:
+            actions.setdefault(keyword, []).append(action)
+
+    register(POPUP_KEYWORDS, _set_flag('needs_popup'))
+    register(CONTENT_KEYWORDS, _set_flag('needs_content_script'))
+    register(BACKGROUND_KEYWORDS, _set_flag('needs_background'))
+    register(CSS_KEYWORDS, _set_flag('needs_css'))
+    for triggers, granted in PERMISSION_RULES:
+        register(triggers, _grant(granted))
+    return {keyword: tuple(funcs) for keyword, funcs in actions.items()}
+
+
+ACTIONS = _build_actions()
+
+# Feature labels reported for each component
+FEATURES = (
+    ('needs_popup', 'popup_ui'),
+    ('needs_content_script', 'content_modification'),
+    ('needs_background', 'background_logic'),
+)
+
+
+def _new_requirements():
+    """Empty requirements dict as produced for a prompt with no keywords"""
+    return {
+        'needs_popup': False,
+        'needs_content_script': False,
+        'needs_background': False,
+        'needs_css': False,
+        'permissions': set(),
+        'features': set()
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _analyze_cached(prompt):
+    """Run the keyword analysis for ``prompt`` and return an immutable result.
+
+    Returns ``(needs_popup, needs_content_script, needs_background,
+    needs_css, permissions, features)`` with ``permissions`` as a frozenset
+    and ``features`` as a sorted tuple, so repeated prompts are served from
+    the cache without sharing mutable state between callers.
+    """
+    requirements = _new_requirements()
+
+    # One scan over the prompt, then only the keywords that hit do work
+    hits = find_keywords(_get_keyword_index(), prompt)
+    for keyword in hits:
+        for action in ACTIONS.get(keyword, ()):
+            action(requirements)
+
+    # Special cases that need popup for display
+    if 'extract' in hits and 'display' in hits:
+        requirements['needs_popup'] = True
+
+    # Special case: if it's a timer/notification tool, needs popup for controls
+    if not hits.isdisjoint(TIMER_KEYWORDS):
+        requirements['needs_popup'] = True
+
+    # Content script permissions
+    if requirements['needs_content_script']:
+        requirements['permissions'].update(('activeTab', 'scripting'))
+
+    # Auto-enable CSS if popup is needed
+    if requirements['needs_popup']:
+        requirements['needs_css'] = True
+
+    for flag, feature in FEATURES:
+        if requirements[flag]:
+            requirements['features'].add(feature)
+
+    return (
+        requirements['needs_popup'],
+        requirements['needs_content_script'],
+        requirements['needs_background'],
+        requirements['needs_css'],
+        frozenset(requirements['permissions']),
+        tuple(sorted(requirements['features'])),
+    )
+
+
+def clear_caches():
+    """Forget every memoized analysis, e.g. to time prompts seen for the first time"""
+    _analyze_cached.cache_clear()
+
+
+# _analyze_cached() result for a prompt without any keywords
+_NOTHING_DETECTED = (False, False, False, False, frozenset(), ())
+
+
+def analyze_prompt(prompt):
+    """Analyze ``prompt`` and return a fresh requirements dict.
+
+    Pure function over the cached analysis; the returned dict (and its
+    permission set / feature list) belongs to the caller.
+    """
+    if not prompt or prompt.isspace():
+        result = _NOTHING_DETECTED
+    else:
+        result = _analyze_cached(prompt)
+    popup, content, background, css, permissions, features = result
+    return {
+        'needs_popup': popup,
+        'needs_content_script': content,
+        'needs_background': background,
+        'needs_css': css,
+        'permissions': set(permissions),
+        'features': list(features),
+        'original_prompt': prompt,
+    }
+
+
+def analyze_many(prompts):
+    """Analyze every prompt in ``prompts``, reusing the shared keyword trie"""
+    return [analyze_prompt(prompt) for prompt in prompts]
 
 
 class PromptAnalyzer:
     """Part A - Analyzes user prompts to determine extension requirements"""
     
+    __slots__ = ('prompt', 'requirements')
+    
     def __init__(self, user_prompt):
-        self.prompt = user_prompt.lower()
-        self.requirements = {
-            'needs_popup': False,
-            'needs_content_script': False,
-            'needs_background': False,
-            'needs_css': False,
-            'permissions': set(),
-            'features': []
-        }
+        self.prompt = user_prompt
+        self.requirements = _new_requirements()
     
     def analyze(self):
         """Analyze the prompt and determine all requirements"""
-        self._detect_popup()
-        self._detect_content_script()
-        self._detect_background()
-        self._detect_permissions()
-        self._detect_css()
-        
-        # Store original prompt for description
-        self.requirements['original_prompt'] = self.prompt
-        
+        self.requirements.update(analyze_prompt(self.prompt))
         return self.requirements
-    
-    def _detect_popup(self):
-        """Detect if a popup UI is needed"""
-        popup_keywords = [
-            'popup', 'button in', 'menu', 'click a button', 'interface', 'ui',
-            'show a popup', 'display', 'panel', 'window', 'input', 'form',
-            'today\'s date', 'calculator', 'converter', 'list'
-        ]
-        
-        # Keywords that suggest user interaction via popup
-        for keyword in popup_keywords:
-            if keyword in self.prompt:
-                self.requirements['needs_popup'] = True
-                self.requirements['features'].append('popup_ui')
-                break
-        
-        # Special cases that need popup for display
-        if 'extract' in self.prompt and 'display' in self.prompt:
-            self.requirements['needs_popup'] = True
-            if 'popup_ui' not in self.requirements['features']:
-                self.requirements['features'].append('popup_ui')
-        
-        # Special case: if it's a timer/notification tool, needs popup for controls
-        if ('timer' in self.prompt or 'pomodoro' in self.prompt) and not self.requirements['needs_popup']:
-            self.requirements['needs_popup'] = True
-            self.requirements['features'].append('popup_ui')
-    
-    def _detect_content_script(self):
-        """Detect if content script is needed (webpage modification)"""
-        content_keywords = [
-            'highlight', 'webpage', 'website', 'page', 'dom', 'text',
-            'change', 'modify', 'replace', 'extract', 'find', 'search',
-            'color', 'style', 'hide', 'remove', 'add', 'insert',
-            'phone number', 'email', 'link', 'image', 'element',
-            'all websites', 'any website', 'every page'
-        ]
-        
-        for keyword in content_keywords:
-            if keyword in self.prompt:
-                self.requirements['needs_content_script'] = True
-                self.requirements['features'].append('content_modification')
-                break
-    
-    def _detect_background(self):
-        """Detect if background script is needed"""
-        background_keywords = [
-            'block', 'blocking', 'automation', 'automatic', 'alarm',
-            'timer', 'schedule', 'filter', 'url', 'monitor', 'track',
-            'every time', 'on startup', 'browser opens', 'redirect',
-            'intercept', 'request', 'api call', 'fetch', 'listener'
-        ]
-        
-        for keyword in background_keywords:
-            if keyword in self.prompt:
-                self.requirements['needs_background'] = True
-                self.requirements['features'].append('background_logic')
-                break
-    
-    def _detect_permissions(self):
-        """Detect required permissions based on features"""
-        permissions = self.requirements['permissions']
-        
-        # Content script permissions
-        if self.requirements['needs_content_script']:
-            permissions.add('activeTab')
-            permissions.add('scripting')
-        
-        # Storage permission (common for most extensions)
-        if 'storage' in self.prompt or 'save' in self.prompt or 'remember' in self.prompt:
-            permissions.add('storage')
-        
-        # Tabs permission
-        if 'tab' in self.prompt or 'url' in self.prompt or 'website' in self.prompt:
-            permissions.add('tabs')
-        
-        # WebRequest permissions for blocking
-        if 'block' in self.prompt or 'filter' in self.prompt:
-            permissions.add('webRequest')
-            permissions.add('webRequestBlocking')
-            permissions.add('declarativeNetRequest')
-            permissions.add('declarativeNetRequestWithHostAccess')
-        
-        # Alarms permission
-        if 'alarm' in self.prompt or 'timer' in self.prompt or 'schedule' in self.prompt:
-            permissions.add('alarms')
-    
-    def _detect_css(self):
-        """Detect if CSS styling is needed"""
-        css_keywords = [
-            'style', 'css', 'color', 'theme', 'design', 'beautiful',
-            'styled', 'gradient', 'background', 'font', 'layout'
-        ]
-        
-        for keyword in css_keywords:
-            if keyword in self.prompt:
-                self.requirements['needs_css'] = True
-                break
-        
-        # Auto-enable CSS if popup is needed
-        if self.requirements['needs_popup']:
-            self.requirements['needs_css'] = True
+
+
+def _banner(title):
+    """Centered title between two 60-column rules"""
+    return f"{_RULE}\n{title.center(60)}\n{_RULE}"
+
+
+_RULE = "=" * 60
+_HEADER = _banner("ChromeForge - Chrome Extension Generator") + "\n"
+_ANALYZING_BANNER = "\n" + _banner("Analyzing your prompt...") + "\n"
+_MANIFEST_BANNER = _banner("Generating Manifest V3...") + "\n"
+_FILES_BANNER = _banner("Generating Extension Files...") + "\n"
+_DONE_BANNER = _banner("✅ Extension Generation Complete!")
+
+
+@dataclass(frozen=True)
+class ManifestAnalysis:
+    """Part A output in the shape expected by Part B (generate_manifest)"""
+    name: str = "Generated Extension"
+    version: str = "1.0"
+    description: str = ""
+    need_popup: bool = False
+    need_content: bool = False
+    need_background: bool = False
+    need_css: bool = False
+    permissions: List[str] = field(default_factory=list)
+    content_matches: List[str] = field(default_factory=list)
 
 
 def convert_to_manifest_format(requirements, user_prompt):
     """Convert Part A requirements to Part B manifest format"""
-    return {
-        "name": "Generated Extension",
-        "version": "1.0",
-        "description": user_prompt[:100],  # Use first 100 chars of prompt
-        "need_popup": requirements['needs_popup'],
-        "need_content": requirements['needs_content_script'],
-        "need_background": requirements['needs_background'],
-        "need_css": requirements['needs_css'],
-        "permissions": list(requirements['permissions']),
-        "content_matches": ["<all_urls>"] if requirements['needs_content_script'] else []
-    }
+    analysis = ManifestAnalysis(
+        description=user_prompt[:100],  # Use first 100 chars of prompt
+        need_popup=requirements['needs_popup'],
+        need_content=requirements['needs_content_script'],
+        need_background=requirements['needs_background'],
+        need_css=requirements['needs_css'],
+        permissions=list(requirements['permissions']),
+        content_matches=["<all_urls>"] if requirements['needs_content_script'] else [],
+    )
+    return asdict(analysis)
 
 
 def main():
     """Main function to run ChromeForge"""
-    print("=" * 60)
-    print("ChromeForge - Chrome Extension Generator".center(60))
-    print("=" * 60)
-    print()
+    # Imported here so analysis-only users of this module don't pay for them
+    from manifest_builder import dump_manifest, generate_manifest
+    from code_generator import CodeGenerator
+
+    print(_HEADER)
     
     # Get user input
     print("Describe the Chrome Extension you want to generate:")
@@ -169,28 +387,28 @@ def main():
         print("Error: Please provide a description.")
         return
     
-    print("\n" + "=" * 60)
-    print("Analyzing your prompt...".center(60))
-    print("=" * 60 + "\n")
+    print(_ANALYZING_BANNER)
     
     # Part A - Analyze the prompt
     analyzer = PromptAnalyzer(user_prompt)
     requirements = analyzer.analyze()
     
-    # Display analysis results
-    print("📊 Analysis Results:")
-    print(f"  • Needs Popup UI: {requirements['needs_popup']}")
-    print(f"  • Needs Content Script: {requirements['needs_content_script']}")
-    print(f"  • Needs Background Script: {requirements['needs_background']}")
-    print(f"  • Needs CSS Styling: {requirements['needs_css']}")
-    print(f"  • Required Permissions: {', '.join(requirements['permissions']) if requirements['permissions'] else 'None'}")
-    print(f"  • Detected Features: {', '.join(requirements['features']) if requirements['features'] else 'None'}")
-    print()
+    # Display analysis results (one write for the whole summary)
+    permissions = ', '.join(requirements['permissions']) or 'None'
+    features = ', '.join(requirements['features']) or 'None'
+    sys.stdout.write(
+        "📊 Analysis Results:\n"
+        f"  • Needs Popup UI: {requirements['needs_popup']}\n"
+        f"  • Needs Content Script: {requirements['needs_content_script']}\n"
+        f"  • Needs Background Script: {requirements['needs_background']}\n"
+        f"  • Needs CSS Styling: {requirements['needs_css']}\n"
+        f"  • Required Permissions: {permissions}\n"
+        f"  • Detected Features: {features}\n"
+        "\n"
+    )
     
     # Part B - Generate Manifest
-    print("=" * 60)
-    print("Generating Manifest V3...".center(60))
-    print("=" * 60 + "\n")
+    print(_MANIFEST_BANNER)
     
     # Enable Gemini by default for styles, popup and content generation.
     # If `GEMINI_API_KEY` is not present or the client call fails, the
@@ -204,25 +422,19 @@ def main():
     manifest = generate_manifest(manifest_analysis)
     
     print("\n📄 Generated Manifest Preview:")
-    print(json.dumps(manifest, indent=2))
+    print(dump_manifest(manifest, pretty=True).decode('utf-8'))
     print()
     
     # Part C - Generate Code Files
-    print("=" * 60)
-    print("Generating Extension Files...".center(60))
-    print("=" * 60 + "\n")
+    print(_FILES_BANNER)
     
     generator = CodeGenerator(requirements, user_prompt)
     generated_files = generator.generate_all_files("generated_extension")
     
-    print("✅ Generated Files:")
-    for file in generated_files:
-        print(f"  • {file}")
-    print()
+    file_lines = "".join(f"  • {file}\n" for file in generated_files)
+    sys.stdout.write(f"✅ Generated Files:\n{file_lines}\n")
     
-    print("=" * 60)
-    print("✅ Extension Generation Complete!".center(60))
-    print("=" * 60)
+    print(_DONE_BANNER)
     print("\nYour extension is ready in 'generated_extension' folder")
     print("Load it in Chrome: chrome://extensions/ > Load unpacked")
     print()
@@ -5,8 +5,12 @@ Part C — Dynamic Code Generation
 Generates HTML, JS, and CSS files based on analysis requirements
 """
 
+import functools
+import json
 import os
-from typing import Dict
+import string
+
+from chrome_forge import compile_keywords, find_keywords
 
 try:
     # optional import — gemini_client is provided but may raise if requests isn't available
@@ -14,35 +18,32 @@ try:
 except Exception:
     gemini_generate_files = None
 
-
-class CodeGenerator:
-    """Generates code files for Chrome extension based on requirements"""
-    
-    def __init__(self, requirements, user_prompt):
-        self.requirements = requirements
-        self.user_prompt = user_prompt
-        self.prompt_lower = user_prompt.lower()
-
-        # If caller explicitly requests Gemini-driven generation, note it here.
-        # The presence of a key 'use_gemini' (truthy) in requirements triggers
-        # an attempt to call the Gemini client. If the client isn't available
-        # or API key isn't provided, a RuntimeError will be raised by the
-        # client — callers are expected to handle that.
-        self.use_gemini = bool(self.requirements.get('use_gemini'))
-    
-    def generate_popup_html(self):
-        """Generate popup.html based on user prompt"""
-        
-        # Detect what the popup should contain
-        has_button = 'button' in self.prompt_lower or 'click' in self.prompt_lower
-        has_input = 'input' in self.prompt_lower or 'form' in self.prompt_lower
-        has_timer = 'timer' in self.prompt_lower or 'pomodoro' in self.prompt_lower
-        show_date = 'date' in self.prompt_lower
-        show_time = 'time' in self.prompt_lower
-        extract_emails = 'extract' in self.prompt_lower and 'email' in self.prompt_lower
-        needs_content_interaction = self.requirements.get('needs_content_script', False)
-        
-        html = """<!DOCTYPE html>
+try:
+    # optional JS minifier; scripts are written unminified when it's missing
+    from rjsmin import jsmin as _jsmin
+except ImportError:
+    _jsmin = None
+
+# Prompt keywords looked up by CodeGenerator._detect_features
+_FEATURE_KEYWORDS = (
+    'button', 'click', 'input', 'form', 'timer', 'pomodoro', 'date', 'time',
+    'extract', 'email', 'block', 'alarm', 'monitor', 'track',
+    'facebook', 'tiktok', 'youtube',
+)
+_FEATURE_INDEX = compile_keywords(_FEATURE_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=128)
+def _find_keywords(prompt_lower):
+    """Return the feature keywords that start a word of the lowercased prompt"""
+    # Same word rules as the analyzer: 'email' matches "emails" but 'date'
+    # does not match "update"
+    return frozenset(find_keywords(_FEATURE_INDEX, prompt_lower))
+
+# Static fragments of the generated files. The generate_* methods pick and
+# join these according to the prompt's features.
+
+_POPUP_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -54,115 +55,78 @@ class CodeGenerator:
     <div class="container">
         <h1>Generated Extension</h1>
 """
-        
-        # Compact content: include extract button and generic action when relevant
-        # Date/time displays (compact placement)
-        if show_date:
-            html += '        <div class="content"><h2>Today\'s Date</h2> <p id="date-display"></p></div>\n'
 
-        if show_time:
-            html += '        <div class="content"><h2>Current Time</h2> <p id="time-display"></p></div>\n'
-        if extract_emails:
-            html += (
-                '        <div class="content"><h2>Email Extractor</h2>'
-                ' <button id="extract-btn">Extract Emails</button>'
-                ' <div id="email-list"></div><p id="email-count"></p></div>\n'
-            )
-
-        if has_button or needs_content_interaction:
-            html += (
-                '        <div class="content">'
-                ' <button id="action-btn">Execute Action</button>'
-                ' <p id="status"></p></div>\n'
-            )
-
-        # Minimal fallback
-        if not (extract_emails or has_button or has_input or has_timer or show_date or show_time):
-            html += '        <div class="content"><p>Extension is active.</p> <button id="action-btn">Click Me</button></div>\n'
-        
-        html += """    </div>
+_POPUP_HTML_DATE = '        <div class="content"><h2>Today\'s Date</h2> <p id="date-display"></p></div>\n'
+_POPUP_HTML_TIME = '        <div class="content"><h2>Current Time</h2> <p id="time-display"></p></div>\n'
+_POPUP_HTML_EMAILS = (
+    '        <div class="content"><h2>Email Extractor</h2>'
+    ' <button id="extract-btn">Extract Emails</button>'
+    ' <div id="email-list"></div><p id="email-count"></p></div>\n'
+)
+_POPUP_HTML_ACTION = (
+    '        <div class="content">'
+    ' <button id="action-btn">Execute Action</button>'
+    ' <p id="status"></p></div>\n'
+)
+_POPUP_HTML_DEFAULT = '        <div class="content"><p>Extension is active.</p> <button id="action-btn">Click Me</button></div>\n'
+
+_POPUP_HTML_FOOT = """    </div>
     <script src="popup.js"></script>
 </body>
 </html>"""
-        
-        return html
-    
-    def generate_popup_js(self):
-        """Generate popup.js based on user prompt"""
-        
-        has_button = 'button' in self.prompt_lower or 'click' in self.prompt_lower
-        has_timer = 'timer' in self.prompt_lower or 'pomodoro' in self.prompt_lower
-        show_date = 'date' in self.prompt_lower
-        show_time = 'time' in self.prompt_lower
-        needs_content_interaction = self.requirements.get('needs_content_script', False)
-        extract_emails = 'extract' in self.prompt_lower and 'email' in self.prompt_lower
-        
-        # Build a concise popup script that supports extract and execute actions
-        js = (
-            "// Popup script for generated extension\n"
-            "document.addEventListener('DOMContentLoaded', function(){\n"
-        )
 
-        # Populate date/time if requested
-        if show_date:
-            js += (
-                "    const dateDisplay = document.getElementById('date-display');\n"
-                "    if(dateDisplay){ const today = new Date(); const opts = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' }; dateDisplay.textContent = today.toLocaleDateString('en-US', opts); }\n\n"
-            )
-
-        if show_time:
-            js += (
-                "    const timeDisplay = document.getElementById('time-display');\n"
-                "    if(timeDisplay){ function updateTime(){ const now=new Date(); timeDisplay.textContent = now.toLocaleTimeString(); } updateTime(); setInterval(updateTime, 1000); }\n\n"
-            )
-
-        if extract_emails or has_button:
-            js += (
-                "    async function postToActiveTab(msg){\n"
-                "        const [tab]=await chrome.tabs.query({active:true,currentWindow:true});\n"
-                "        return new Promise(res=>chrome.tabs.sendMessage(tab.id,msg,res));\n"
-                "    }\n\n"
-            )
-
-            if extract_emails:
-                js += (
-                    "    const extractBtn=document.getElementById('extract-btn');\n"
-                    "    if(extractBtn){\n"
-                    "        extractBtn.addEventListener('click',async()=>{\n"
-                    "            const resp=await postToActiveTab({action:'getEmails'});\n"
-                    "            const list=document.getElementById('email-list');\n"
-                    "            const count=document.getElementById('email-count');\n"
-                    "            if(resp&&resp.emails&&resp.emails.length){\n"
-                    "                list.innerHTML='<ul style=\"text-align:left;margin-top:10px;\">'+resp.emails.map(e=>`<li style=\"padding:5px;word-break:break-all;\">${e}</li>`).join('')+'</ul>';\n"
-                    "                count.textContent='Found '+resp.emails.length+' email(s)';\n"
-                    "            }else{ list.innerHTML='<p style=\"margin-top:10px;\">No emails found on this page.</p>'; count.textContent=''; }\n"
-                    "        });\n"
-                    "    }\n\n"
-                )
-
-            # generic action button
-            js += (
-                "    const actionBtn=document.getElementById('action-btn');\n"
-                "    if(actionBtn){\n"
-                "        actionBtn.addEventListener('click',async()=>{\n"
-                "            const resp=await postToActiveTab({action:'execute'});\n"
-                "            const status=document.getElementById('status'); if(status) status.textContent=(resp&&resp.message)||'Action executed';\n"
-                "        });\n"
-                "    }\n\n"
-            )
-
-        js += "});\n"
-        return js
-    
-    def generate_content_js(self):
-        """Generate content.js based on user prompt"""
-        # Compact content script: single listener handles actions
-        js = """// Content script - runs on web pages
+_POPUP_JS_HEAD = (
+    "// Popup script for generated extension\n"
+    "document.addEventListener('DOMContentLoaded', function(){\n"
+)
+_POPUP_JS_DATE = (
+    "    const dateDisplay = document.getElementById('date-display');\n"
+    "    if(dateDisplay){ const today = new Date(); const opts = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' }; dateDisplay.textContent = today.toLocaleDateString('en-US', opts); }\n\n"
+)
+_POPUP_JS_TIME = (
+    "    const timeDisplay = document.getElementById('time-display');\n"
+    "    if(timeDisplay){ function updateTime(){ const now=new Date(); timeDisplay.textContent = now.toLocaleTimeString(); } updateTime(); setInterval(updateTime, 1000); }\n\n"
+)
+_POPUP_JS_MESSAGING = (
+    "    async function postToActiveTab(msg){\n"
+    "        const [tab]=await chrome.tabs.query({active:true,currentWindow:true});\n"
+    "        return new Promise(res=>chrome.tabs.sendMessage(tab.id,msg,res));\n"
+    "    }\n\n"
+)
+_POPUP_JS_EMAILS = (
+    "    const extractBtn=document.getElementById('extract-btn');\n"
+    "    if(extractBtn){\n"
+    "        extractBtn.addEventListener('click',async()=>{\n"
+    "            const resp=await postToActiveTab({action:'getEmails'});\n"
+    "            const list=document.getElementById('email-list');\n"
+    "            const count=document.getElementById('email-count');\n"
+    "            if(resp&&resp.emails&&resp.emails.length){\n"
+    "                list.innerHTML='<ul style=\"text-align:left;margin-top:10px;\">'+resp.emails.map(e=>`<li style=\"padding:5px;word-break:break-all;\">${e}</li>`).join('')+'</ul>';\n"
+    "                count.textContent='Found '+resp.emails.length+' email(s)';\n"
+    "            }else{ list.innerHTML='<p style=\"margin-top:10px;\">No emails found on this page.</p>'; count.textContent=''; }\n"
+    "        });\n"
+    "    }\n\n"
+)
+_POPUP_JS_ACTION = (
+    "    const actionBtn=document.getElementById('action-btn');\n"
+    "    if(actionBtn){\n"
+    "        actionBtn.addEventListener('click',async()=>{\n"
+    "            const resp=await postToActiveTab({action:'execute'});\n"
+    "            const status=document.getElementById('status'); if(status) status.textContent=(resp&&resp.message)||'Action executed';\n"
+    "        });\n"
+    "    }\n\n"
+)
+_POPUP_JS_FOOT = "});\n"
+
+# Email addresses matched by the generated content script (JS regex source)
+_EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
+
+_CONTENT_JS = string.Template("""// Content script - runs on web pages
 
 console.log('Content script loaded');
 
 function extractEmails(){
-    const re=/\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\\b/g;
+    const re=/$email_pattern/g;
     return (document.body.innerText.match(re)||[]);
 }
 
@@ -180,36 +144,23 @@ chrome.runtime.onMessage.addListener(function(request,sender,sendResponse){
 // Auto-extract on load for debugging
 console.log('Auto-extracted', extractEmails().length, 'emails from page');
 
-"""
-        return js
-    
-    def generate_background_js(self):
-        """Generate background.js service worker"""
-        
-        block_sites = 'block' in self.prompt_lower
-        timer = 'timer' in self.prompt_lower or 'alarm' in self.prompt_lower
-        monitor = 'monitor' in self.prompt_lower or 'track' in self.prompt_lower
-        
-        js = """// Background service worker
+""").substitute(email_pattern=_EMAIL_PATTERN)
+
+_BACKGROUND_JS_HEAD = """// Background service worker
 
 console.log('Background service worker loaded');
 
 """
-        
-        # Site blocking logic
-        if block_sites:
-            blocked_sites = []
-            if 'facebook' in self.prompt_lower:
-                blocked_sites.append('*://*.facebook.com/*')
-            if 'tiktok' in self.prompt_lower:
-                blocked_sites.append('*://*.tiktok.com/*')
-            if 'youtube' in self.prompt_lower:
-                blocked_sites.append('*://*.youtube.com/*')
-            
-            if not blocked_sites:
-                blocked_sites = ['*://example.com/*']
-            
-            js += f"""// Block specific websites
+
+# URL patterns blocked for each site named in the prompt
+_SITE_PATTERNS = {
+    'facebook': '*://*.facebook.com/*',
+    'tiktok': '*://*.tiktok.com/*',
+    'youtube': '*://*.youtube.com/*',
+}
+
+# str.format template; literal braces are doubled
+_BACKGROUND_JS_BLOCK = """// Block specific websites
 const blockedSites = {blocked_sites};
 
 chrome.webRequest.onBeforeRequest.addListener(
@@ -223,13 +174,14 @@ chrome.webRequest.onBeforeRequest.addListener(
 console.log('Blocking these sites:', blockedSites);
 
 """
-        
-        # Timer/Alarm functionality
-        if timer:
-            js += """// Timer alarm functionality
+
+# Minutes between timer alarms in the generated background script
+_ALARM_MINUTES = 25
+
+_BACKGROUND_JS_ALARM = string.Template("""// Timer alarm functionality
 chrome.alarms.create('timerAlarm', {
-    delayInMinutes: 25,
-    periodInMinutes: 25
+    delayInMinutes: $minutes,
+    periodInMinutes: $minutes
 });
 
 chrome.alarms.onAlarm.addListener(function(alarm) {
@@ -244,11 +196,9 @@ chrome.alarms.onAlarm.addListener(function(alarm) {
     }
 });
 
-"""
-        
-        # URL monitoring
-        if monitor:
-            js += """// Monitor and track URLs
+""").substitute(minutes=_ALARM_MINUTES)
+
+_BACKGROUND_JS_MONITOR = """// Monitor and track URLs
 chrome.tabs.onUpdated.addListener(function(tabId, changeInfo, tab) {
     if (changeInfo.status === 'complete' && tab.url) {
         console.log('Visited URL:', tab.url);
@@ -266,10 +216,8 @@ chrome.tabs.onUpdated.addListener(function(tabId, changeInfo, tab) {
 });
 
 """
-        
-        # Default background logic
-        if not (block_sites or timer or monitor):
-            js += """// Extension installation
+
+_BACKGROUND_JS_DEFAULT = """// Extension installation
 chrome.runtime.onInstalled.addListener(function() {
     console.log('Extension installed successfully');
 });
@@ -282,13 +230,8 @@ chrome.runtime.onMessage.addListener(function(request, sender, sendResponse) {
 });
 
 """
-        
-        return js
-    
-    def generate_styles_css(self):
-        """Generate styles.css for popup"""
-        
-        css = """/* Styles for extension popup */
+
+_STYLES_CSS = """/* Styles for extension popup */
 
 * {
     margin: 0;
@@ -383,88 +326,274 @@ p {
     font-style: italic;
 }
 """
+
+# styles.css never changes, so it is encoded once for writing
+_STYLES_CSS_BYTES = _STYLES_CSS.encode('utf-8')
+
+
+# Renderers are cached on their feature flags, so every CodeGenerator with
+# the same features shares one rendered copy of each file.
+
+# Bits of the popup feature mask
+(_POPUP_DATE, _POPUP_TIME, _POPUP_EMAILS, _POPUP_BUTTON,
+ _POPUP_INPUT, _POPUP_TIMER, _POPUP_CONTENT) = (1 << n for n in range(7))
+
+# Optional popup.html sections in page order, with the bits that enable them
+_POPUP_HTML_SECTIONS = (
+    (_POPUP_DATE, _POPUP_HTML_DATE),
+    (_POPUP_TIME, _POPUP_HTML_TIME),
+    (_POPUP_EMAILS, _POPUP_HTML_EMAILS),
+    (_POPUP_BUTTON | _POPUP_CONTENT, _POPUP_HTML_ACTION),
+)
+
+# Features that replace the minimal fallback content
+_POPUP_HTML_FEATURES = (
+    _POPUP_DATE | _POPUP_TIME | _POPUP_EMAILS | _POPUP_BUTTON | _POPUP_INPUT | _POPUP_TIMER
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_popup_html(mask):
+    """Assemble popup.html from the sections enabled in the feature mask"""
+    parts = [_POPUP_HTML_HEAD]
+    parts.extend(section for bits, section in _POPUP_HTML_SECTIONS if mask & bits)
+
+    # Minimal fallback
+    if not mask & _POPUP_HTML_FEATURES:
+        parts.append(_POPUP_HTML_DEFAULT)
+    
+    parts.append(_POPUP_HTML_FOOT)
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_popup_js(show_date, show_time, extract_emails, has_button):
+    """Assemble popup.js from its fragments"""
+    # Build a concise popup script that supports extract and execute actions
+    parts = [_POPUP_JS_HEAD]
+
+    # Populate date/time if requested
+    if show_date:
+        parts.append(_POPUP_JS_DATE)
+    if show_time:
+        parts.append(_POPUP_JS_TIME)
+
+    if extract_emails or has_button:
+        parts.append(_POPUP_JS_MESSAGING)
+        if extract_emails:
+            parts.append(_POPUP_JS_EMAILS)
+        # generic action button
+        parts.append(_POPUP_JS_ACTION)
+
+    parts.append(_POPUP_JS_FOOT)
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_background_js(block_sites, alarm, monitor, sites):
+    """Assemble background.js from its fragments"""
+    parts = [_BACKGROUND_JS_HEAD]
+    
+    # Site blocking logic
+    if block_sites:
+        blocked_sites = [_SITE_PATTERNS[site] for site in sites] or ['*://example.com/*']
         
-        return css
+        parts.append(_BACKGROUND_JS_BLOCK.format(blocked_sites=json.dumps(blocked_sites)))
+    
+    # Timer/Alarm functionality
+    if alarm:
+        parts.append(_BACKGROUND_JS_ALARM)
+    
+    # URL monitoring
+    if monitor:
+        parts.append(_BACKGROUND_JS_MONITOR)
+    
+    # Default background logic
+    if not (block_sites or alarm or monitor):
+        parts.append(_BACKGROUND_JS_DEFAULT)
+    
+    return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=128)
+def _encode(text):
+    """Return text as UTF-8 bytes, reusing earlier encodings of the same file"""
+    return text.encode('utf-8')
+
+
+@functools.lru_cache(maxsize=128)
+def _encode_js(text, minify):
+    """Return a rendered script as UTF-8 bytes, minified when asked and rjsmin is installed"""
+    if minify and _jsmin is not None:
+        text = _jsmin(text)
+    return text.encode('utf-8')
+
+
+def clear_caches():
+    """Forget every memoized keyword lookup, render and encoding in this module"""
+    for cached in (_find_keywords, _render_popup_html, _render_popup_js,
+                   _render_background_js, _encode, _encode_js):
+        cached.cache_clear()
+
+
+# Requirement flags that each ask generate_all_files for at least one file
+_NEEDS_KEYS = ('needs_popup', 'needs_content_script', 'needs_background', 'needs_css')
+
+
+# The files are small, so each is written with raw os.write calls rather than
+# through Python's buffered file objects
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_bytes(path, data):
+    """Replace the file at path with data"""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_outputs(output_dir, outputs):
+    """Write (file name, text or UTF-8 bytes) pairs into output_dir and return the names"""
+    base = os.path.join(output_dir, '')
+    for fname, content in outputs:
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        _write_bytes(base + fname, content)
+    return [fname for fname, _ in outputs]
+
+
+class CodeGenerator:
+    """Generates code files for Chrome extension based on requirements"""
+
+    __slots__ = ('requirements', 'user_prompt', 'prompt_lower', 'use_gemini', 'minify', 'needs', 'ctx')
+    
+    def __init__(self, requirements, user_prompt):
+        self.requirements = requirements
+        self.user_prompt = user_prompt
+        self.prompt_lower = user_prompt.lower()
+
+        # If caller explicitly requests Gemini-driven generation, note it here.
+        # The presence of a key 'use_gemini' (truthy) in requirements triggers
+        # an attempt to call the Gemini client. If the client isn't available
+        # or API key isn't provided, a RuntimeError will be raised by the
+        # client — callers are expected to handle that.
+        self.use_gemini = bool(self.requirements.get('use_gemini'))
+
+        # Generated scripts are minified unless requirements['minify'] is falsy
+        self.minify = bool(self.requirements.get('minify', True))
+
+        # needs_popup, needs_content_script, needs_background, needs_css
+        self.needs = tuple(bool(self.requirements.get(key, False)) for key in _NEEDS_KEYS)
+
+        # Feature flags shared by all generate_* methods, computed once
+        self.ctx = self._detect_features()
+    
+    def _detect_features(self):
+        """Work out which popup/background features the prompt asks for"""
+        found = _find_keywords(self.prompt_lower)
+        ctx = {
+            'has_button': 'button' in found or 'click' in found,
+            'has_input': 'input' in found or 'form' in found,
+            'has_timer': 'timer' in found or 'pomodoro' in found,
+            'show_date': 'date' in found,
+            'show_time': 'time' in found,
+            'extract_emails': 'extract' in found and 'email' in found,
+            'needs_content_interaction': self.needs[1],
+            'block_sites': 'block' in found,
+            'alarm': 'timer' in found or 'alarm' in found,
+            'monitor': 'monitor' in found or 'track' in found,
+            'sites': tuple(site for site in _SITE_PATTERNS if site in found),
+        }
+        ctx['popup_mask'] = (
+            _POPUP_DATE * ctx['show_date']
+            | _POPUP_TIME * ctx['show_time']
+            | _POPUP_EMAILS * ctx['extract_emails']
+            | _POPUP_BUTTON * ctx['has_button']
+            | _POPUP_INPUT * ctx['has_input']
+            | _POPUP_TIMER * ctx['has_timer']
+            | _POPUP_CONTENT * ctx['needs_content_interaction']
+        )
+        return ctx
+    
+    def generate_popup_html(self):
+        """Generate popup.html based on user prompt"""
+        return _render_popup_html(self.ctx['popup_mask'])
+    
+    def generate_popup_js(self):
+        """Generate popup.js based on user prompt"""
+        ctx = self.ctx
+        return _render_popup_js(
+            ctx['show_date'], ctx['show_time'], ctx['extract_emails'], ctx['has_button'],
+        )
+    
+    def generate_content_js(self):
+        """Generate content.js based on user prompt"""
+        # Compact content script: single listener handles actions
+        return _CONTENT_JS
+    
+    def generate_background_js(self):
+        """Generate background.js service worker"""
+        ctx = self.ctx
+        return _render_background_js(
+            ctx['block_sites'], ctx['alarm'], ctx['monitor'], ctx['sites'],
+        )
+    
+    def generate_styles_css(self):
+        """Generate styles.css for popup"""
+        return _STYLES_CSS
     
     def generate_all_files(self, output_dir="generated_extension"):
         """Generate all required files based on requirements"""
+        need_popup, need_content, need_background, need_css = self.needs
+        use_gemini = self.use_gemini and gemini_generate_files
+
+        # Nothing to write: don't even create the output directory
+        if not use_gemini and not any(self.needs):
+            return []
+
         os.makedirs(output_dir, exist_ok=True)
         
-        generated_files = []
-        
         # If configured to use Gemini / LLM, try to ask it for the files directly
-        if self.use_gemini and gemini_generate_files:
+        if use_gemini:
             try:
                 files_map = gemini_generate_files(self.requirements, self.user_prompt)
                 if not isinstance(files_map, dict):
                     raise RuntimeError('Gemini client returned an unexpected shape')
 
-                for fname, content in files_map.items():
-                    # Only write files we know we want (guards and whitelist)
-                    if fname not in ('popup.html', 'popup.js', 'content.js', 'styles.css'):
-                        continue
-                    with open(os.path.join(output_dir, fname), 'w', encoding='utf-8') as f:
-                        f.write(content)
-                    generated_files.append(fname)
+                # Only write files we know we want (guards and whitelist)
+                outputs = [
+                    (fname, content) for fname, content in files_map.items()
+                    if fname in ('popup.html', 'popup.js', 'content.js', 'styles.css')
+                ]
 
                 # When using Gemini we skip local generation of the same files
-                return generated_files
+                return _write_outputs(output_dir, outputs)
             except Exception as exc:
                 # Don't crash the whole flow — fall back to default generator
                 print('⚠️ Gemini generation failed, falling back to heuristic generator: ', exc)
 
+        outputs = []
+
         # Generate popup files
-        if self.requirements.get('needs_popup', False):
-            popup_html = self.generate_popup_html()
-            popup_js = self.generate_popup_js()
-            
-            with open(os.path.join(output_dir, 'popup.html'), 'w', encoding='utf-8') as f:
-                f.write(popup_html)
-            generated_files.append('popup.html')
-            
-            with open(os.path.join(output_dir, 'popup.js'), 'w', encoding='utf-8') as f:
-                f.write(popup_js)
-            generated_files.append('popup.js')
+        if need_popup:
+            outputs.append(('popup.html', _encode(self.generate_popup_html())))
+            outputs.append(('popup.js', _encode_js(self.generate_popup_js(), self.minify)))
         
         # Generate content script
-        if self.requirements.get('needs_content_script', False):
-            content_js = self.generate_content_js()
-            with open(os.path.join(output_dir, 'content.js'), 'w', encoding='utf-8') as f:
-                f.write(content_js)
-            generated_files.append('content.js')
+        if need_content:
+            outputs.append(('content.js', _encode_js(self.generate_content_js(), self.minify)))
         
         # Generate background script
-        if self.requirements.get('needs_background', False):
-            background_js = self.generate_background_js()
-            with open(os.path.join(output_dir, 'background.js'), 'w', encoding='utf-8') as f:
-                f.write(background_js)
-            generated_files.append('background.js')
+        if need_background:
+            outputs.append(('background.js', _encode_js(self.generate_background_js(), self.minify)))
         
         # Generate CSS
-        if self.requirements.get('needs_css', False):
-            styles_css = self.generate_styles_css()
-            with open(os.path.join(output_dir, 'styles.css'), 'w', encoding='utf-8') as f:
-                f.write(styles_css)
-            generated_files.append('styles.css')
+        if need_css:
+            outputs.append(('styles.css', _STYLES_CSS_BYTES))
         
-        return generated_files
-
+        return _write_outputs(output_dir, outputs)
 
-if __name__ == "__main__":
-    # Test the code generator
-    print("Testing Code Generator...\n")
-    
-    # Test case 1: Popup with date
-    test_requirements = {
-        'needs_popup': True,
-        'needs_content_script': False,
-        'needs_background': False,
-        'needs_css': True,
-        'permissions': set()
-    }
-    
-    generator = CodeGenerator(test_requirements, "Create an extension that shows a popup with today's date.")
-    files = generator.generate_all_files("test_code_gen")
-    
-    print(f"Generated files: {', '.join(files)}")
-    print("Check 'test_code_gen' folder for output")
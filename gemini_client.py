@@ -15,12 +15,24 @@ import logging
 from typing import Dict, Any
 
 try:
-    import requests
-except Exception:  # requests may not be installed in test environments
-    requests = None
+    # optional fast decoder for response bodies; falls back to the json module
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 LOGGER = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _import_requests():
+    """Import requests on first use; it accounts for most of this module's import time."""
+    try:
+        import requests
+    except Exception:  # requests may not be installed in test environments
+        return None
+    return requests
+
 
 def build_prompt(requirements: Dict[str, Any], user_prompt: str) -> str:
     """Construct a prompt for the Gemini LLM asking it to return files.
@@ -48,17 +60,15 @@ def build_prompt(requirements: Dict[str, Any], user_prompt: str) -> str:
 def parse_response_text_as_json(text: str) -> Dict[str, str]:
     """Try to recover a JSON object from free-form text returned by LLMs.
 
-    This attempts to find the first JSON-like substring and parse it.
+    This parses the first JSON object in the text and ignores anything after it.
     """
-    # quick search for first { ... } block
     start = text.find('{')
-    end = text.rfind('}')
-    if start == -1 or end == -1 or end <= start:
+    if start == -1:
         raise ValueError("No JSON object found in response")
 
-    candidate = text[start:end + 1]
     try:
-        return json.loads(candidate)
+        obj, _ = _JSON_DECODER.raw_decode(text, start)
+        return obj
     except json.JSONDecodeError as exc:
         LOGGER.exception('Failed to decode JSON from candidate')
         raise
@@ -79,6 +89,7 @@ def generate_files(requirements: Dict[str, Any], user_prompt: str) -> Dict[str,
     # Allow override of endpoint for testing or alternate deployments
     endpoint = os.environ.get('GEMINI_API_URL', 'https://api.openai.google/v1/complete')
 
+    requests = _import_requests()
     if requests is None:
         raise RuntimeError('requests package not installed; cannot call Gemini API')
 
@@ -98,10 +109,11 @@ def generate_files(requirements: Dict[str, Any], user_prompt: str) -> Dict[str,
     resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
     resp.raise_for_status()
 
-    # Accept JSON body (preferred) or raw text that contains JSON
+    # Accept JSON body (preferred) or raw text that contains JSON. The body is
+    # parsed straight from bytes, so it is not also held as a decoded str.
     try:
-        body = resp.json()
-    except Exception:
+        body = _loads(resp.content)
+    except ValueError:
         # Attempt to parse free-form text
         body_text = resp.text
         return parse_response_text_as_json(body_text)
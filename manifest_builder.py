@@ -9,31 +9,44 @@ Usage:
 
 import json
 import os
+import re
 from typing import Dict, List, Any
 
+try:
+    # optional fast encoder; the stdlib json module is used when it's missing
+    import orjson
+except ImportError:
+    orjson = None
+
+# <all_urls>, anything containing :// (including *://), or a leading * or http
+_HOST_PATTERN = re.compile(r'<all_urls>\Z|\*|http|.*://', re.DOTALL)
+
 def is_host_pattern(s: str) -> bool:
     """Rudimentary detection for host permission patterns vs normal API permissions."""
-    if not isinstance(s, str):
-        return False
-    s = s.strip()
-    # treat <all_urls> and anything containing :// or wildcard *:// or leading * as host pattern
-    return (
-        s == "<all_urls>"
-        or "://" in s
-        or s.startswith("*")
-        or s.startswith("http")
-        or s.startswith("https")
-    )
+    return isinstance(s, str) and _HOST_PATTERN.match(s.strip()) is not None
 
 def normalize_version(v: str) -> str:
     if not v:
         return "1.0"
     return v
 
-def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extension") -> Dict[str, Any]:
+def dump_manifest(manifest: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Serialize a manifest dict to UTF-8 JSON bytes, indented when pretty is set."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(manifest, option=option)
+    if pretty:
+        return json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+
+def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extension",
+                      pretty: bool = False) -> Dict[str, Any]:
     """
     Build and write a manifest.json for Manifest V3 based on analysis dict.
 
+    The file is written as compact JSON; pass pretty=True for an indented,
+    human-readable manifest when debugging.
+
     Expected analysis keys (examples):
       - name: str
       - version: str
@@ -51,33 +64,26 @@ def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extens
     version = normalize_version(analysis.get("version", "1.0"))
     description = analysis.get("description", analysis.get("desc", ""))
 
-    need_popup = bool(analysis.get("need_popup"))
-    need_content = bool(analysis.get("need_content"))
-    need_background = bool(analysis.get("need_background"))
-    need_css = bool(analysis.get("need_css"))
+    need_content = analysis.get("need_content")
 
-    raw_permissions: List[str] = analysis.get("permissions", []) or []
+    raw_permissions: List[str] = analysis.get("permissions") or ()
     # content_matches default
-    content_matches: List[str] = analysis.get("content_matches", []) or []
+    content_matches: List[str] = analysis.get("content_matches") or []
     if need_content and not content_matches:
         # If content script is requested but no matches provided, default to all pages
         content_matches = ["<all_urls>"]
 
     # split raw_permissions into permissions (APIs) and host_permissions (URL patterns)
-    permissions_list: List[str] = []
-    host_permissions: List[str] = []
+    split: Dict[bool, List[str]] = {True: [], False: []}
     for p in raw_permissions:
-        if is_host_pattern(p):
-            if p not in host_permissions:
-                host_permissions.append(p)
-        else:
-            if p not in permissions_list:
-                permissions_list.append(p)
+        split[is_host_pattern(p)].append(p)
 
     # If content_matches have host patterns, we may add them to host_permissions
-    for m in content_matches:
-        if is_host_pattern(m) and m not in host_permissions:
-            host_permissions.append(m)
+    split[True].extend(m for m in content_matches if is_host_pattern(m))
+
+    # dedupe, keeping the first occurrence of each entry in order
+    permissions_list: List[str] = list(dict.fromkeys(split[False]))
+    host_permissions: List[str] = list(dict.fromkeys(split[True]))
 
     # Construct the manifest dict
     manifest: Dict[str, Any] = {
@@ -93,7 +99,7 @@ def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extens
         manifest["icons"] = icons
 
     # action / popup
-    if need_popup:
+    if analysis.get("need_popup"):
         # manifest.action for MV3
         action_obj = {}
         default_popup = analysis.get("popup_file", "popup.html")
@@ -108,7 +114,7 @@ def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extens
         manifest["action"] = action_obj
 
     # background (service worker) for MV3
-    if need_background:
+    if analysis.get("need_background"):
         service_worker = analysis.get("background_file", "background.js")
         manifest["background"] = {"service_worker": service_worker}
 
@@ -116,7 +122,7 @@ def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extens
     if need_content:
         cs_files = analysis.get("content_js", ["content.js"])
         cs_css = []
-        if need_css:
+        if analysis.get("need_css"):
             cs_css = analysis.get("content_css", ["styles.css"])
         content_entry = {
             "matches": content_matches,
@@ -140,52 +146,8 @@ def generate_manifest(analysis: Dict[str, Any], out_dir: str = "generated_extens
     # Final: ensure folder exists and write manifest.json
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, "manifest.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    with open(out_path, "wb") as f:
+        f.write(dump_manifest(manifest, pretty))
 
     print(f"[+] Wrote manifest to: {out_path}")
     return manifest
-
-# ----------------------------
-# Example usages / test scenarios
-# ----------------------------
-if __name__ == "__main__":
-    examples = {
-        "popup_date": {
-            "name": "Today Date Popup",
-            "version": "1.0",
-            "description": "Shows today's date in a popup",
-            "need_popup": True,
-            "need_content": False,
-            "need_background": False,
-            "need_css": False,
-            "permissions": []
-        },
-        "highlight_phone": {
-            "name": "Phone Highlighter",
-            "version": "1.0",
-            "description": "Highlights phone numbers on pages",
-            "need_popup": False,
-            "need_content": True,
-            "need_background": False,
-            "need_css": True,
-            "permissions": ["activeTab"],
-            # content scripts will run on all pages by default
-        },
-        "block_sites": {
-            "name": "Site Blocker",
-            "version": "1.0",
-            "description": "Blocks Facebook and TikTok",
-            "need_popup": False,
-            "need_content": False,
-            "need_background": True,
-            "need_css": False,
-            "permissions": ["webRequest", "webRequestBlocking", "<all_urls>"]
-        }
-    }
-
-    # write three manifests to subfolders for quick testing
-    for key, ana in examples.items():
-        outdir = os.path.join("generated_extension_examples", key)
-        m = generate_manifest(ana, out_dir=outdir)
-        print(f"\n== {key} manifest ==\n{json.dumps(m, indent=2)}\n")
@@ -0,0 +1,146 @@
+import os
+from dataclasses import dataclass, field
+
+import pytest
+
+import code_generator
+from chrome_forge import analyze_many
+from code_generator import CodeGenerator
+
+
+@dataclass(frozen=True)
+class Expected:
+    popup: bool
+    content: bool
+    background: bool
+    css: bool
+
+    @property
+    def files(self):
+        """Names of the files CodeGenerator should write for these requirements"""
+        files = {'popup.html', 'popup.js'} if self.popup else set()
+        if self.content:
+            files.add('content.js')
+        if self.background:
+            files.add('background.js')
+        if self.css:
+            files.add('styles.css')
+        return files
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    prompt: str
+    expected: Expected
+    slug: str = field(init=False)
+
+    def __post_init__(self):
+        # output folder name, computed once with the table
+        object.__setattr__(self, 'slug', self.name.replace(' ', '_').lower())
+
+
+# The SAMPLE_PROMPTS.txt test cases
+CASES = (
+    Scenario('Simple Popup', "Create an extension that shows a popup with today's date.",
+             Expected(popup=True, content=False, background=False, css=True)),
+    Scenario('Phone Number Highlighter', 'Make an extension that highlights all phone numbers on any website.',
+             Expected(popup=False, content=True, background=False, css=False)),
+    Scenario('Website Blocker', 'Block Facebook and TikTok every time the browser opens.',
+             Expected(popup=False, content=False, background=True, css=False)),
+    Scenario('Text Color Changer', 'A tool that changes all webpage text to blue when I click a button in the popup.',
+             Expected(popup=True, content=True, background=False, css=True)),
+    Scenario('Pomodoro Timer', 'Create a pomodoro timer that shows a notification every 25 minutes.',
+             Expected(popup=True, content=False, background=True, css=True)),
+    Scenario('Email Extractor', 'Extract all email addresses from the current page and display them in a list.',
+             Expected(popup=True, content=True, background=False, css=True)),
+)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'gemini_behavior(kind): install a fake Gemini client that returns gemini_files '
+        '("success") or raises ("fail")',
+    )
+    config.addinivalue_line('markers', 'slow: test does real disk I/O that a faster test already covers')
+
+
+def pytest_generate_tests(metafunc):
+    """Run every test that takes a ``scenario`` argument once per entry of CASES."""
+    if 'scenario' in metafunc.fixturenames:
+        metafunc.parametrize('scenario', CASES, ids=[scenario.name for scenario in CASES])
+
+
+@pytest.fixture(scope='session')
+def analyses():
+    """Requirements for every scenario prompt, analyzed in one batch up front"""
+    prompts = [scenario.prompt for scenario in CASES]
+    return dict(zip(prompts, analyze_many(prompts)))
+
+
+@pytest.fixture
+def base_requirements():
+    """Requirements for a popup + content script extension generated through Gemini."""
+    return {
+        'needs_popup': True,
+        'needs_content_script': True,
+        'needs_background': False,
+        'needs_css': True,
+        'permissions': set(),
+        'use_gemini': True
+    }
+
+
+@pytest.fixture
+def make_cg(base_requirements):
+    """Build a CodeGenerator for a prompt from the shared requirements."""
+    return lambda prompt: CodeGenerator(base_requirements, prompt)
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """Install a fake Gemini client returning the given files map, or failing when given None."""
+    def install(files_map):
+        def generate(requirements, prompt):
+            if files_map is None:
+                raise RuntimeError('simulated AI failure')
+            return files_map
+
+        monkeypatch.setattr(code_generator, 'gemini_generate_files', generate)
+
+    return install
+
+
+@pytest.fixture
+def gemini_files():
+    """Files map returned by the fake Gemini client on success."""
+    return {
+        'popup.html': '<html><body>AI POPUP</body></html>',
+        'popup.js': "console.log('ai popup');",
+        'content.js': "console.log('ai content');",
+        'styles.css': 'body { color: red; }'
+    }
+
+
+@pytest.fixture(autouse=True)
+def _gemini_behavior(request):
+    """Apply the gemini_behavior marker, if the test has one."""
+    marker = request.node.get_closest_marker('gemini_behavior')
+    if marker is None:
+        return
+    kind, = marker.args
+    files_map = request.getfixturevalue('gemini_files') if kind == 'success' else None
+    request.getfixturevalue('fake_gemini')(files_map)
+
+
+@pytest.fixture
+def captured_writes(monkeypatch):
+    """Collect the files CodeGenerator writes as {file name: text} instead of writing them."""
+    writes = {}
+
+    def capture(path, data):
+        writes[os.path.basename(path)] = data.decode('utf-8')
+
+    monkeypatch.setattr(code_generator, '_write_bytes', capture)
+    return writes
@@ -0,0 +1,27 @@
+"""
+Smoke run of the code generator (moved out of code_generator.py).
+
+Run from the repository root:
+    python -m tests.smoke_code_generator
+"""
+
+from code_generator import CodeGenerator
+
+
+if __name__ == "__main__":
+    print("Testing Code Generator...\n")
+
+    # Test case 1: Popup with date
+    test_requirements = {
+        'needs_popup': True,
+        'needs_content_script': False,
+        'needs_background': False,
+        'needs_css': True,
+        'permissions': set()
+    }
+
+    generator = CodeGenerator(test_requirements, "Create an extension that shows a popup with today's date.")
+    files = generator.generate_all_files("test_code_gen")
+
+    print(f"Generated files: {', '.join(files)}")
+    print("Check 'test_code_gen' folder for output")
@@ -0,0 +1,53 @@
+"""
+Example manifests / test scenarios (moved out of manifest_builder.py).
+
+Run from the repository root:
+    python -m tests.smoke_manifest_builder
+"""
+
+import json
+import os
+
+from manifest_builder import generate_manifest
+
+
+if __name__ == "__main__":
+    examples = {
+        "popup_date": {
+            "name": "Today Date Popup",
+            "version": "1.0",
+            "description": "Shows today's date in a popup",
+            "need_popup": True,
+            "need_content": False,
+            "need_background": False,
+            "need_css": False,
+            "permissions": []
+        },
+        "highlight_phone": {
+            "name": "Phone Highlighter",
+            "version": "1.0",
+            "description": "Highlights phone numbers on pages",
+            "need_popup": False,
+            "need_content": True,
+            "need_background": False,
+            "need_css": True,
+            "permissions": ["activeTab"],
+            # content scripts will run on all pages by default
+        },
+        "block_sites": {
+            "name": "Site Blocker",
+            "version": "1.0",
+            "description": "Blocks Facebook and TikTok",
+            "need_popup": False,
+            "need_content": False,
+            "need_background": True,
+            "need_css": False,
+            "permissions": ["webRequest", "webRequestBlocking", "<all_urls>"]
+        }
+    }
+
+    # write three manifests to subfolders for quick testing
+    for key, ana in examples.items():
+        outdir = os.path.join("generated_extension_examples", key)
+        m = generate_manifest(ana, out_dir=outdir)
+        print(f"\n== {key} manifest ==\n{json.dumps(m, indent=2)}\n")
@@ -0,0 +1,33 @@
+"""Latency benchmarks for the end-to-end scenarios; skipped unless pytest-benchmark is installed.
+
+Every round starts from empty memo caches, so it times a prompt seen for the
+first time. Compare runs with e.g. ``pytest tests/test_benchmarks.py
+--benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:10%``.
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import chrome_forge
+import code_generator
+from chrome_forge import PromptAnalyzer, convert_to_manifest_format
+from code_generator import CodeGenerator
+from manifest_builder import generate_manifest
+
+
+def _clear_caches():
+    """pedantic() setup: forget every earlier prompt before a round"""
+    chrome_forge.clear_caches()
+    code_generator.clear_caches()
+
+
+def test_scenario_latency(benchmark, tmp_path, scenario):
+    prompt = scenario.prompt
+
+    def run():
+        requirements = PromptAnalyzer(prompt).analyze()
+        generate_manifest(convert_to_manifest_format(requirements, prompt), out_dir=str(tmp_path))
+        return CodeGenerator(requirements, prompt).generate_all_files(str(tmp_path))
+
+    files = benchmark.pedantic(run, setup=_clear_caches, rounds=200)
+    assert set(files) == scenario.expected.files
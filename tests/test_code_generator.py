@@ -0,0 +1,78 @@
+import re
+
+import pytest
+
+import code_generator
+from code_generator import CodeGenerator
+
+
+@pytest.fixture
+def stub_jsmin(monkeypatch):
+    """Install a marker-prepending minifier; _encode_js is cleared so no cached bytes bypass it."""
+    monkeypatch.setattr(code_generator, '_jsmin', lambda text: '/*min*/' + text)
+    code_generator._encode_js.cache_clear()
+    yield
+    code_generator._encode_js.cache_clear()
+
+
+@pytest.mark.parametrize('prompt', [
+    "Create an extension that shows a popup with today's date.",
+    'Show the current time in a popup',
+    'Extract all email addresses and display them',
+    'Click a button to show the date and time',
+    'Update the page',
+])
+def test_popup_html_and_js_agree_on_features(prompt):
+    """popup.js drives exactly the date/time/extract elements popup.html renders."""
+    cg = CodeGenerator({'needs_popup': True}, prompt)
+    html = cg.generate_popup_html()
+    js = cg.generate_popup_js()
+
+    for element_id in ('date-display', 'time-display', 'extract-btn'):
+        assert (f'id="{element_id}"' in html) == (f"getElementById('{element_id}')" in js)
+
+
+def test_content_script_email_pattern_rejects_pipe_in_domain():
+    """The emitted email regex uses [A-Za-z] for the TLD, not the buggy [A-Z|a-z]."""
+    content_js = CodeGenerator({'needs_content_script': True}, 'Extract emails').generate_content_js()
+    pattern = re.search(r'const re=/(.+)/g;', content_js).group(1)
+
+    assert re.findall(pattern, 'mail me at jo@example.com') == ['jo@example.com']
+    assert re.findall(pattern, 'not an address: jo@example.c|m') == []
+
+
+@pytest.mark.parametrize('minify', [True, False])
+def test_scripts_are_minified_unless_disabled(stub_jsmin, captured_writes, tmp_path, minify):
+    """popup.js, content.js and background.js go through the minifier; minify=False writes them as generated."""
+    requirements = {'needs_popup': True, 'needs_content_script': True, 'needs_background': True,
+                    'needs_css': True, 'minify': minify}
+    cg = CodeGenerator(requirements, 'Click a button to block YouTube')
+    cg.generate_all_files(str(tmp_path))
+
+    scripts = {
+        'popup.js': cg.generate_popup_js(),
+        'content.js': cg.generate_content_js(),
+        'background.js': cg.generate_background_js(),
+    }
+    for fname, script in scripts.items():
+        assert captured_writes[fname] == ('/*min*/' + script if minify else script)
+    assert captured_writes['popup.html'] == cg.generate_popup_html()
+
+
+@pytest.mark.parametrize('prompt, element_id', [
+    ('Update the page', 'date-display'),
+    ('Sometimes hide the page', 'time-display'),
+])
+def test_keywords_inside_words_do_not_enable_popup_sections(prompt, element_id):
+    """'date' in "update" and 'time' in "sometimes" are not feature keywords."""
+    assert f'id="{element_id}"' not in CodeGenerator({'needs_popup': True}, prompt).generate_popup_html()
+
+
+def test_clear_caches_empties_every_module_cache(captured_writes, tmp_path):
+    """clear_caches() must cover every lru_cache in the module, including ones added later."""
+    requirements = {'needs_popup': True, 'needs_content_script': True, 'needs_background': True, 'needs_css': True}
+    CodeGenerator(requirements, 'Click a button to block YouTube').generate_all_files(str(tmp_path))
+    code_generator.clear_caches()
+
+    caches = [obj for obj in vars(code_generator).values() if hasattr(obj, 'cache_info')]
+    assert caches and all(cache.cache_info().currsize == 0 for cache in caches)
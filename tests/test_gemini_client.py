@@ -0,0 +1,7 @@
+from gemini_client import parse_response_text_as_json
+
+
+def test_parse_response_stops_at_end_of_first_object():
+    """Braces after the JSON object, or inside its strings, must not break parsing."""
+    text = 'Sure! {"popup.js": "if (x) { go(); }"} Hope this helps :-}'
+    assert parse_response_text_as_json(text) == {'popup.js': 'if (x) { go(); }'}
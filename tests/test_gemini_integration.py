@@ -1,72 +1,35 @@
-import os
-import shutil
-from pathlib import Path
-
 import pytest
 
-from code_generator import CodeGenerator
-
-
-def test_generate_files_with_gemini_success(tmp_path, monkeypatch):
-    """When the Gemini client returns a proper mapping, generator should write files."""
-    # Fake gemini map
-    fake_map = {
-        'popup.html': '<html><body>AI POPUP</body></html>',
-        'popup.js': "console.log('ai popup');",
-        'content.js': "console.log('ai content');",
-        'styles.css': 'body { color: red; }'
-    }
 
-    # Patch the local imported reference
-    import code_generator
+@pytest.mark.parametrize('expect_fallback', [
+    pytest.param(False, marks=pytest.mark.gemini_behavior('success'), id='success'),
+    pytest.param(True, marks=pytest.mark.gemini_behavior('fail'), id='fallback'),
+])
+def test_gemini_paths(tmp_path, make_cg, gemini_files, captured_writes, expect_fallback):
+    """Gemini's files are passed through as-is; if the client fails, the built-in generator takes over."""
+    cg = make_cg('Make a small UI and content script')
+    files = cg.generate_all_files(str(tmp_path))
 
-    monkeypatch.setattr(code_generator, 'gemini_generate_files', lambda r, p: fake_map)
+    if expect_fallback:
+        assert {'popup.html', 'popup.js', 'content.js', 'styles.css'}.issubset(files)
+        assert captured_writes['popup.html'] != gemini_files['popup.html']
+    else:
+        assert set(files) == set(gemini_files.keys())
+        assert captured_writes == gemini_files
 
-    requirements = {
-        'needs_popup': True,
-        'needs_content_script': True,
-        'needs_background': False,
-        'needs_css': True,
-        'permissions': set(),
-        'use_gemini': True
-    }
 
+@pytest.mark.slow
+@pytest.mark.gemini_behavior('success')
+def test_generate_files_with_gemini_success_on_disk(tmp_path, make_cg, gemini_files):
+    """When the Gemini client returns a proper mapping, generator should write files."""
     out_dir = tmp_path / 'generated_extension'
-    cg = CodeGenerator(requirements, 'Make a small UI and content script')
+    cg = make_cg('Make a small UI and content script')
     files = cg.generate_all_files(str(out_dir))
 
-    assert set(files) == set(fake_map.keys())
+    assert set(files) == set(gemini_files.keys())
 
     # Validate file contents written
-    for fname, content in fake_map.items():
+    for fname, content in gemini_files.items():
         written = (out_dir / fname).read_text(encoding='utf-8')
         assert content == written
 
-
-def test_gemini_failure_fallback(tmp_path, monkeypatch):
-    """If Gemini client fails, generator should fall back to built-in generation."""
-    import code_generator
-
-    def raise_err(r, p):
-        raise RuntimeError('simulated AI failure')
-
-    monkeypatch.setattr(code_generator, 'gemini_generate_files', raise_err)
-
-    requirements = {
-        'needs_popup': True,
-        'needs_content_script': True,
-        'needs_background': False,
-        'needs_css': True,
-        'permissions': set(),
-        'use_gemini': True
-    }
-
-    out_dir = tmp_path / 'generated_extension'
-    cg = CodeGenerator(requirements, 'Make a small UI and content script')
-    files = cg.generate_all_files(str(out_dir))
-
-    # The fallback generator should have created the typical files
-    assert 'popup.html' in files
-    assert 'popup.js' in files
-    assert 'content.js' in files
-    assert 'styles.css' in files
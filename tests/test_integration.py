@@ -0,0 +1,45 @@
+"""End-to-end runs of the SAMPLE_PROMPTS.txt test cases: analysis, manifest and files."""
+import json
+from dataclasses import asdict
+
+import pytest
+
+from chrome_forge import convert_to_manifest_format
+from code_generator import CodeGenerator
+from manifest_builder import dump_manifest, generate_manifest
+
+
+# Expected field -> analyzer requirement key
+_REQUIREMENT_KEYS = {
+    'popup': 'needs_popup',
+    'content': 'needs_content_script',
+    'background': 'needs_background',
+    'css': 'needs_css',
+}
+
+
+@pytest.fixture(scope='session')
+def test_output_root(tmp_path_factory):
+    """Scratch folder holding one subfolder per scenario (separate per xdist worker)"""
+    return tmp_path_factory.mktemp('manifests')
+
+
+# parametrized over conftest.CASES by pytest_generate_tests
+def test_scenario(test_output_root, analyses, scenario):
+    prompt, expected = scenario.prompt, scenario.expected
+    out_dir = test_output_root / scenario.slug
+    requirements = analyses[prompt]
+    detected = {flag: requirements[key] for flag, key in _REQUIREMENT_KEYS.items()}
+    assert detected == asdict(expected), f'detection mismatch for {prompt!r}'
+
+    manifest = generate_manifest(convert_to_manifest_format(requirements, prompt), out_dir=str(out_dir))
+    assert json.loads((out_dir / 'manifest.json').read_bytes()) == manifest
+    # The manifest is only serialized for the report when an assertion fails
+    sections = {key: key in manifest for key in ('action', 'content_scripts', 'background')}
+    assert manifest['manifest_version'] == 3, dump_manifest(manifest, pretty=True).decode('utf-8')
+    assert sections == {'action': expected.popup, 'content_scripts': expected.content,
+                        'background': expected.background}, dump_manifest(manifest, pretty=True).decode('utf-8')
+
+    files = CodeGenerator(requirements, prompt).generate_all_files(str(out_dir))
+    assert set(files) == expected.files
+    assert all((out_dir / fname).is_file() for fname in files)
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+import manifest_builder
+from manifest_builder import generate_manifest
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_manifest_is_compact_unless_pretty(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(manifest_builder, 'orjson', None)
+    elif manifest_builder.orjson is None:
+        pytest.skip('orjson is not installed')
+    analysis = {'name': 'Café Timer', 'need_popup': True, 'permissions': ['alarms']}
+
+    manifest = generate_manifest(analysis, out_dir=str(tmp_path / 'compact'))
+    compact = (tmp_path / 'compact' / 'manifest.json').read_text(encoding='utf-8')
+    assert '\n' not in compact
+    assert json.loads(compact) == manifest
+
+    generate_manifest(analysis, out_dir=str(tmp_path / 'pretty'), pretty=True)
+    pretty = (tmp_path / 'pretty' / 'manifest.json').read_text(encoding='utf-8')
+    assert '\n  "name": "Café Timer"' in pretty
+    assert json.loads(pretty) == manifest
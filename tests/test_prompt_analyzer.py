@@ -0,0 +1,75 @@
+import pytest
+
+import chrome_forge
+from chrome_forge import PromptAnalyzer, analyze_many, analyze_prompt
+
+
+def test_keywords_match_whole_words_and_plurals():
+    """Keywords match at word starts, so plurals hit but embedded words do not."""
+    requirements = PromptAnalyzer('Make an extension that highlights all phone numbers.').analyze()
+    assert requirements['needs_content_script']
+
+    requirements = PromptAnalyzer('Call my telephone').analyze()
+    assert not requirements['needs_content_script']
+
+
+def test_prefix_matched_last_word_can_start_another_keyword():
+    """'every time' must not swallow the 'timer' keyword that follows it."""
+    requirements = PromptAnalyzer('Ring every timer').analyze()
+    assert 'alarms' in requirements['permissions']
+
+
+def test_short_inner_keyword_words_match_whole_words_only():
+    """The 'a' of 'show a popup' / 'click a button' must not match "automatic" or "add"."""
+    requirements = PromptAnalyzer('Show automatic popup reminders').analyze()
+    assert requirements['needs_background']
+
+    requirements = PromptAnalyzer('click add button').analyze()
+    assert requirements['needs_content_script']
+    assert not requirements['needs_popup']
+
+
+@pytest.mark.parametrize('prompt', [
+    "Add a 'block' button for 'facebook'",
+    'Add a ‘block’ button for ‘facebook’',
+])
+def test_quoted_keywords_are_detected(prompt):
+    """Quote marks around a keyword separate it; only an apostrophe inside a word is kept."""
+    requirements = analyze_prompt(prompt)
+    assert requirements['needs_background']
+    assert 'declarativeNetRequest' in requirements['permissions']
+
+
+@pytest.mark.parametrize('prompt', ["Make a 'popup' that shows the time", 'Use a ‘timer’'])
+def test_quoted_popup_keywords_are_detected(prompt):
+    assert analyze_prompt(prompt)['needs_popup']
+
+
+def test_apostrophe_inside_a_word_is_kept():
+    assert analyze_prompt('Show today’s date')['needs_popup']
+
+
+def test_cached_results_are_not_shared_between_callers():
+    """Mutating one result must not leak into the next analysis of the same prompt."""
+    first, second = analyze_many(['Block Facebook', 'Block Facebook'])
+    first['permissions'].add('storage')
+
+    assert 'storage' not in second['permissions']
+    assert 'storage' not in analyze_prompt('Block Facebook')['permissions']
+
+
+def test_blank_prompt_detects_nothing():
+    requirements = analyze_prompt('   ')
+    assert not any(requirements[k] for k in ('needs_popup', 'needs_content_script',
+                                             'needs_background', 'needs_css'))
+    assert requirements['permissions'] == set()
+    assert requirements['features'] == []
+
+
+def test_clear_caches_empties_every_module_cache():
+    """clear_caches() must cover every lru_cache in the module, including ones added later."""
+    analyze_prompt('Block Facebook')
+    chrome_forge.clear_caches()
+
+    caches = [obj for obj in vars(chrome_forge).values() if hasattr(obj, 'cache_info')]
+    assert caches and all(cache.cache_info().currsize == 0 for cache in caches)